@@ -1,97 +1,273 @@
 import os
 import csv
-import re
-from typing import List, Dict
+import json
+import string
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from typing import Dict, List
+
+try:
+    # google-re2 scans in linear time; the patterns below avoid
+    # backreferences/lookaround so both engines accept them unchanged.
+    import re2 as re
+except ImportError:
+    import re
 
 SOURCE_DIR = "articles"
 OUTPUT_CSV = "extracted_funding_data.csv"
+# The "Source:" and "Date:" lines are only looked for in the first
+# HEADER_SIZE bytes. The scraper writes Source: there; a "Date:" line comes
+# from the article body, so one further down is deliberately ignored.
+HEADER_SIZE = 2048
+# Per-directory cache of extracted rows, keyed by file name and invalidated
+# when a file's mtime or size changes
+CACHE_FILENAME = ".extraction_cache.json"
+# Stored in the cache; bump whenever the patterns or extraction logic change
+# so rows extracted by an older version are not reused
+EXTRACTOR_VERSION = 3
+
+# Patterns are compiled once at import time instead of on every article.
+# They run on the raw UTF-8 bytes: non-ASCII literals (currency signs, the
+# no-break space) are spelled out as characters and encoded, so both engines
+# see plain byte sequences, and RE2's \s being ASCII-only does not matter.
+#
+# Case-insensitive fields are matched against an ASCII-lowercased copy of the
+# article made once per file, with lowercase-only patterns instead of
+# IGNORECASE. Lowercasing keeps byte offsets, so values are sliced from the
+# original bytes and keep their case.
+#
+# The body patterns are fused into one alternation so the text is scanned
+# once; each branch has a single named group, found via `lastindex`. finditer
+# never returns overlapping matches, so only patterns whose matches cannot run
+# into each other are fused. The greedy "Date:" pattern would swallow the text
+# after it, and an amount's "m" unit can eat the first letter of "March", so
+# the header patterns and the body date are searched separately.
+_SOURCE_RE = re.compile(rb"(?m)^Source:\s*(https?://[^\s]+)")
+_DATE_RE = re.compile(rb"Date:\s*([\w\s,]+)")
+_BODY_DATE_RE = re.compile(
+    rb"\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},\s+\d{4}\b"
+)
+# Optional space inside an amount, including the no-break space
+_AMOUNT_SPACE = "(?:\\s|\u00a0)?"
+_BODY_RE = re.compile((
+    r"\bfounded in (?P<company_since>\d{4})"
+    r"|(?P<funding_amount>(?:€|\$|£)" + _AMOUNT_SPACE + r"\d+(?:[\.,]?\d+)?(?:" + _AMOUNT_SPACE + r"(?:million|billion|m|k|bn))?)"
+    r"|\b(?P<funding_type>seed|series [abc]|venture|angel|growth|bridge) funding\b"
+).encode("utf-8"))
+_NAME_RE = re.compile(rb"(?m)^(.*?)(?:,| has| announced| raises| raised| secured)")
+
+# Funding types by priority: the first type mentioned anywhere in this list
+# wins, not the first one in the text. "pre-seed funding" counts as seed.
+_FUNDING_RANK = {
+    ftype: rank for rank, ftype in enumerate((
+        "seed", "series a", "series b", "series c", "venture", "angel", "growth", "bridge",
+    ))
+}
+_LOWER_TABLE = bytes.maketrans(string.ascii_uppercase.encode("ascii"), string.ascii_lowercase.encode("ascii"))
+
+
+def _group_names(pattern) -> Dict[int, str]:
+    # re2 reports the group names of bytes patterns as bytes
+    return {
+        index: name.decode("ascii") if isinstance(name, bytes) else name
+        for name, index in pattern.groupindex.items()
+    }
+
+
+_BODY_FIELDS = _group_names(_BODY_RE)
+
+@dataclass(slots=True)
+class Article:
+    """
+    Fields extracted from one article; 'undefined' when not found.
+    """
+    company_name: str = "undefined"
+    funding_amount: str = "undefined"
+    funding_type: str = "undefined"
+    article_date: str = "undefined"
+    company_since: str = "undefined"
+    article_url: str = "undefined"
+    filename: str = ""  # origin file, set by extract_all_articles
+
+
+# CSV column order
+KEYS = tuple(f.name for f in fields(Article))
+_article_row = attrgetter(*KEYS)
 
-def extract_info_from_text(text: str) -> Dict[str, str]:
+
+def extract_info_from_text(text: str) -> Article:
     """
     Extract structured data from raw article text.
     Fallback to 'undefined' if data is not found.
     """
-    
-    info = {
-        "company_name": "undefined",
-        "funding_amount": "undefined",
-        "funding_type": "undefined",
-        "article_date": "undefined",
-        "company_since": "undefined",
-        "article_url": "undefined",
-    }
+    return _extract_info_from_bytes(text.encode("utf-8"))
+
+
+def _decode(raw: bytes, start: int, end: int) -> str:
+    return raw[start:end].decode("utf-8", "replace")
+
+
+def _extract_info_from_bytes(raw: bytes) -> Article:
+    info = Article()
 
     
-    match = re.search(r"^Source:\s*(https?://[^\s]+)", text, re.MULTILINE)
+    # URL and "Date:" line, searched in the first HEADER_SIZE bytes only
+    header = raw[:HEADER_SIZE]
+    match = _SOURCE_RE.search(header)
     if match:
-        info["article_url"] = match.group(1)
+        info.article_url = _decode(raw, *match.span(1))
+    match = _DATE_RE.search(header)
+    if not match:
+        # No explicit "Date:" line; fall back to the first date in the text
+        match = _BODY_DATE_RE.search(raw)
+    if match:
+        info.article_date = _decode(raw, *match.span(match.lastindex or 0))
 
-    
-    date_match = re.search(r"Date:\s*([\w\s,]+)", text)
-    if date_match:
-        info["article_date"] = date_match.group(1)
-    else:
-        
-        body_date = re.search(r"\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},\s+\d{4}\b", text)
-        if body_date:
-            info["article_date"] = body_date.group(0)
+    lower = raw.translate(_LOWER_TABLE)
 
-    
-    founded_match = re.search(r"\bfounded in (\d{4})", text, re.IGNORECASE)
-    if founded_match:
-        info["company_since"] = founded_match.group(1)
+    # founded, amount, type
+    missing = 3
+    funding_rank = len(_FUNDING_RANK)
+    for match in _BODY_RE.finditer(lower):
+        field = _BODY_FIELDS[match.lastindex]
+        value = _decode(raw, *match.span(match.lastindex))
+        if field == "funding_type":
+            rank = _FUNDING_RANK[value.lower()]
+            if rank >= funding_rank:
+                continue
+            funding_rank = rank
+            info.funding_type = value.lower().title()
+            if rank:
+                # A higher-priority type may still follow
+                continue
+        elif getattr(info, field) != "undefined":
+            continue
+        elif field == "funding_amount":
+            info.funding_amount = value.replace("\u00a0", " ")
+        else:
+            setattr(info, field, value)
 
-    
-    amount_match = re.search(r"([€$£]\s?\d+(?:[\.,]?\d+)?(?:\s?(?:million|billion|m|k|bn))?)", text, re.IGNORECASE)
-    if amount_match:
-        info["funding_amount"] = amount_match.group(1).replace("\u00a0", " ")  
-
-    # ----- Extract funding type (look for common types)
-    funding_types = ["seed", "pre-seed", "series a", "series b", "series c", "venture", "angel", "growth", "bridge"]
-    for ftype in funding_types:
-        if re.search(rf"\b{ftype} funding\b", text, re.IGNORECASE):
-            info["funding_type"] = ftype.title()
+        missing -= 1
+        if not missing:
             break
 
     # ----- Guess company name
-    # First line after metadata is usually article title
-    lines = text.strip().splitlines()
-    for line in lines[2:6]:  # Skip Source/Title headers, scan next few lines
-        m = re.match(r"^(.*?)(?:,| has| announced| raises| raised| secured)", line, re.IGNORECASE)
-        if m and 2 <= len(m.group(1).split()) <= 5:
-            info["company_name"] = m.group(1).strip()
+    # First line after metadata is usually article title. Skip Source/Title
+    # headers and scan the next few lines (lines 2-5), located with find()
+    # rather than splitting the whole article.
+    start = 0
+    while start < len(raw) and raw[start:start + 1].isspace():
+        start += 1
+    newlines = []
+    pos = start - 1
+    for _ in range(6):
+        pos = raw.find(b"\n", pos + 1)
+        if pos < 0:
             break
+        newlines.append(pos)
+
+    if len(newlines) >= 2:
+        first = newlines[1] + 1
+        end = newlines[5] if len(newlines) == 6 else len(raw)
+        for m in _NAME_RE.finditer(lower[first:end]):
+            name = _decode(raw, first + m.start(1), first + m.end(1))
+            if 2 <= len(name.split()) <= 5:
+                info.company_name = name.strip()
+                break
 
     return info
 
 
-def extract_all_articles(source_dir: str) -> List[Dict[str, str]]:
-    data = []
+def _extract_one(filepath: str) -> Article:
+    """
+    Worker for extract_all_articles: read one article file and extract it.
+    """
+    # Extraction works on the raw bytes, so the file is never decoded
+    with open(filepath, "rb") as f:
+        raw = f.read()
+
+    info = _extract_info_from_bytes(raw)
+    info.filename = os.path.basename(filepath)  # track origin file
+    return info
+
+
+def _load_cache(cache_path: str) -> Dict[str, list]:
+    """
+    Return {filename: [mtime_ns, size, row]}, or {} if the cache is missing,
+    unreadable or was written for a different set of columns or extractor
+    version.
+    """
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict):
+        return {}
+    if cache.get("keys") != list(KEYS) or cache.get("version") != EXTRACTOR_VERSION:
+        return {}
+    return cache.get("files", {})
+
+
+def _save_cache(cache_path: str, files: Dict[str, list]) -> None:
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"keys": list(KEYS), "version": EXTRACTOR_VERSION, "files": files}, f)
+    os.replace(tmp_path, cache_path)
+
+
+def extract_all_articles(source_dir: str) -> List[Article]:
+    cache_path = os.path.join(source_dir, CACHE_FILENAME)
+    cached_files = _load_cache(cache_path)
+    files: Dict[str, list] = {}
+
+    data: List[Article] = []
+    pending = []  # (index in data, path, stat key) of new or changed files
+    with os.scandir(source_dir) as entries:
+        for entry in entries:
+            if not (entry.name.endswith(".txt") and entry.is_file()):
+                continue
+            st = entry.stat()
+            key = [st.st_mtime_ns, st.st_size]
+            cached = cached_files.get(entry.name)
+            if cached is not None and cached[:2] == key:
+                files[entry.name] = cached
+                data.append(Article(*cached[2]))
+            else:
+                pending.append((len(data), entry.path, key))
+                data.append(None)
+    if not data:
+        return []
 
-    for filename in os.listdir(source_dir):
-        if filename.endswith(".txt"):
-            filepath = os.path.join(source_dir, filename)
-            with open(filepath, "r", encoding="utf-8") as f:
-                text = f.read()
+    print(f"[INFO] Extracting from {len(pending)} files ({len(data) - len(pending)} unchanged)...")
+    if pending:
+        # Articles are independent, so spread the regex work over all cores
+        with ProcessPoolExecutor() as executor:
+            results = executor.map(_extract_one, [path for _, path, _ in pending], chunksize=16)
+            for (idx, _, key), info in zip(pending, results):
+                data[idx] = info
+                files[info.filename] = key + [list(_article_row(info))]
 
-            print(f"[INFO] Extracting from: {filename}")
-            info = extract_info_from_text(text)
-            info["filename"] = filename  # track origin file
-            data.append(info)
+    if files != cached_files:
+        # The cache is only an optimisation; a failed save must not lose the run
+        try:
+            _save_cache(cache_path, files)
+        except OSError as e:
+            print(f"[WARN] Could not save extraction cache {cache_path}: {e}")
 
     return data
 
 
-def save_to_csv(data: List[Dict[str, str]], output_file: str):
+def save_to_csv(data: List[Article], output_file: str):
     if not data:
         print("[WARN] No data to write.")
         return
 
-    keys = list(data[0].keys())
-    with open(output_file, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=keys)
-        writer.writeheader()
-        writer.writerows(data)
+    with open(output_file, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(KEYS)
+        writer.writerows([_article_row(info) for info in data])
 
     print(f"[SUCCESS] Extracted data written to {output_file}")
 
@@ -2,10 +2,15 @@
 
 import os
 import time
-import re
-from typing import List, Optional
+import asyncio
+import string
+from typing import Awaitable, Callable, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar, Union
 import cloudscraper
-from bs4 import BeautifulSoup
+import requests
+import httpx
+from lxml import etree
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
 from urllib.parse import urljoin, urlparse
 
 
@@ -15,10 +20,16 @@ DELAY_BETWEEN_REQUESTS = 2.0
 MAX_RETRIES = 3
 RETRY_BACKOFF = 2.0 
 REQUEST_TIMEOUT = 15  
+MAX_CONCURRENT_REQUESTS = 4
+CHUNK_SIZE = 8192
+# Shortest text accepted from a content selector
+MIN_CONTENT_LENGTH = 50
 
 
 ARTICLE_LIMIT: Optional[int] = None
 
+T = TypeVar("T")
+
 
 scraper = cloudscraper.create_scraper(
     browser={
@@ -28,45 +39,63 @@ scraper = cloudscraper.create_scraper(
     }
 )
 
-scraper.headers.update({
+HEADERS = {
     "Accept-Language": "en-US,en;q=0.9",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
     "Referer": "https://www.google.com",
-})
+}
+
+scraper.headers.update(HEADERS)
+
+# Regular fetches go through an HTTP/2 client with the same browser headers;
+# cloudscraper is only used when Cloudflare serves a challenge.
+# Accept-Encoding is left to httpx so it never advertises codecs it lacks.
+CLIENT_HEADERS = {k: v for k, v in scraper.headers.items() if k.lower() != "accept-encoding"}
 
 
 os.makedirs(SAVE_DIR, exist_ok=True)
 
 
 
+_SAFE_CHARS = frozenset((string.ascii_letters + string.digits + "_-.").encode("ascii"))
+_UNSAFE_BYTES = bytes(c for c in range(128) if c not in _SAFE_CHARS)
+
+
 def safe_filename(s: str, max_len: int = 120) -> str:
     """
     Create a filesystem-safe filename from a string.
     """
-    s = s.strip()
-    # Replace spaces with underscores
-    s = re.sub(r"\s+", "_", s)
-    # Keep only safe characters
-    s = re.sub(r"[^A-Za-z0-9_\-\.]", "", s)
+    # Replace runs of whitespace with underscores
+    s = "_".join(s.split())
+    # Keep only safe characters: non-ASCII is dropped by the encode, the
+    # remaining unsafe ASCII bytes by translate
+    s = s.encode("ascii", "ignore").translate(None, _UNSAFE_BYTES).decode("ascii")
     # Trim
     if len(s) > max_len:
         s = s[:max_len]
     return s or "article"
 
 
-def save_article_to_txt(title: str, url: str, content: str) -> None:
-   
+def save_article_to_txt(title: str, url: str, content: str, existing: Set[str]) -> None:
+    """
+    `existing` holds the case-folded file names already in SAVE_DIR; it is
+    checked instead of the filesystem and updated with the name that gets
+    written. Names are compared case-folded because Windows and macOS
+    filesystems are case-insensitive, and os.path.normcase does not fold case
+    on macOS.
+    """
     parsed = urlparse(url)
     slug = parsed.path.rstrip("/").split("/")[-1] or "article"
-    base = f"{slug}_{title[:60]}".strip()
-    filename = safe_filename(base) + ".txt"
-    filepath = os.path.join(SAVE_DIR, filename)
+    base = safe_filename(f"{slug}_{title[:60]}".strip())
+    filename = base + ".txt"
 
     # Avoid overwrite: add numeric suffix
     count = 1
-    while os.path.exists(filepath):
-        filepath = os.path.join(SAVE_DIR, f"{safe_filename(base)}_{count}.txt")
+    while filename.casefold() in existing:
+        filename = f"{base}_{count}.txt"
         count += 1
+    existing.add(filename.casefold())
+    filepath = os.path.join(SAVE_DIR, filename)
 
     with open(filepath, "w", encoding="utf-8") as f:
         # write metadata then content
@@ -77,17 +106,39 @@ def save_article_to_txt(title: str, url: str, content: str) -> None:
     print(f"[SAVED] {os.path.basename(filepath)}")
 
 
-def fetch_html(url: str, timeout: int = REQUEST_TIMEOUT, max_retries: int = MAX_RETRIES) -> Optional[str]:
+def _check_content_type(url: str, headers) -> None:
+    # Basic content-type sanity check
+    ctype = headers.get("Content-Type", "")
+    if "text/html" not in ctype and "application/xhtml+xml" not in ctype:
+        print(f"[WARN] Unexpected Content-Type for {url}: {ctype}")
+
+
+def _iter_body(resp) -> Iterator[bytes]:
+    # Closing the generator (or dropping it) releases the connection
+    with resp:
+        yield from resp.iter_content(CHUNK_SIZE)
+
+
+def fetch_html(
+    url: str,
+    timeout: int = REQUEST_TIMEOUT,
+    max_retries: int = MAX_RETRIES,
+    stream: bool = False,
+) -> Optional[Union[str, requests.Response]]:
+    """
+    Fetch a page. With stream=True the response itself is returned, still
+    unread, so the body can be parsed with _iter_body(resp) while it
+    downloads; pass _header_charset(resp.headers) as its encoding.
+    """
     attempt = 0
     backoff = 1.0
     while attempt < max_retries:
         try:
-            resp = scraper.get(url, timeout=timeout)
+            resp = scraper.get(url, timeout=timeout, stream=stream)
             resp.raise_for_status()
-            # Basic content-type sanity check
-            ctype = resp.headers.get("Content-Type", "")
-            if "text/html" not in ctype and "application/xhtml+xml" not in ctype:
-                print(f"[WARN] Unexpected Content-Type for {url}: {ctype}")
+            _check_content_type(url, resp.headers)
+            if stream:
+                return resp
             return resp.text
         except Exception as e:
             attempt += 1
@@ -101,23 +152,160 @@ def fetch_html(url: str, timeout: int = REQUEST_TIMEOUT, max_retries: int = MAX_
                 print(f"[ERROR] Giving up on {url}")
     return None
 
+
+def _header_charset(headers) -> Optional[str]:
+    """
+    The charset= parameter of Content-Type, or None when there is none.
+    Unlike resp.encoding, this does not default text/html to ISO-8859-1,
+    which would override the page's own <meta charset>.
+    """
+    if "charset" not in headers.get("Content-Type", "").lower():
+        return None
+    return requests.utils.get_encoding_from_headers(headers)
+
+
+def _is_cloudflare_challenge(resp: httpx.Response) -> bool:
+    if resp.status_code not in (403, 503):
+        return False
+    return "cf-mitigated" in resp.headers or "cloudflare" in resp.headers.get("Server", "").lower()
+
+
+async def _with_retries(url: str, fetch: Callable[[], Awaitable[T]], max_retries: int = MAX_RETRIES) -> Optional[T]:
+    """
+    Async counterpart of the retry/backoff loop in fetch_html.
+    """
+    attempt = 0
+    backoff = 1.0
+    while attempt < max_retries:
+        try:
+            return await fetch()
+        except Exception as e:
+            attempt += 1
+            print(f"[ERROR] Fetch {url} failed (attempt {attempt}/{max_retries}): {e}")
+            if attempt < max_retries:
+                sleep_time = backoff * RETRY_BACKOFF
+                print(f"[INFO] Retrying in {sleep_time:.1f}s...")
+                await asyncio.sleep(sleep_time)
+                backoff *= RETRY_BACKOFF
+            else:
+                print(f"[ERROR] Giving up on {url}")
+    return None
+
+
+async def fetch_listing(client: httpx.AsyncClient, url: str, fallback_lock: asyncio.Lock) -> Optional[str]:
+    async def fetch() -> Optional[str]:
+        resp = await client.get(url)
+        if _is_cloudflare_challenge(resp):
+            print(f"[INFO] Cloudflare challenge on {url}, retrying with cloudscraper")
+            async with fallback_lock:
+                return await asyncio.to_thread(fetch_html, url)
+        resp.raise_for_status()
+        _check_content_type(url, resp.headers)
+        return resp.text
+
+    return await _with_retries(url, fetch)
+
+
+async def fetch_article(
+    client: httpx.AsyncClient, url: str, fallback_lock: asyncio.Lock
+) -> Optional[Tuple[str, str]]:
+    """
+    Fetch an article page and return extract_article_content's (title,
+    content), feeding the parser while the body is still downloading.
+
+    The cloudscraper session is shared and not thread-safe, so fallback
+    calls are serialized with fallback_lock.
+    """
+    async def fetch() -> Optional[Tuple[str, str]]:
+        async with client.stream("GET", url) as resp:
+            challenged = _is_cloudflare_challenge(resp)
+            if not challenged:
+                resp.raise_for_status()
+                _check_content_type(url, resp.headers)
+
+                parser = _new_stream_parser(resp.charset_encoding)
+                async for chunk in resp.aiter_bytes(CHUNK_SIZE):
+                    if _feed_stream_parser(parser, chunk):
+                        break
+
+        if challenged:
+            # The httpx stream is closed before falling back
+            print(f"[INFO] Cloudflare challenge on {url}, retrying with cloudscraper")
+            async with fallback_lock:
+                fallback = await asyncio.to_thread(fetch_html, url, stream=True)
+                if fallback is None:
+                    return None
+                return await asyncio.to_thread(extract_article_content, _iter_body(fallback), _header_charset(fallback.headers))
+        return _extract_from_tree(_close_stream_parser(parser))
+
+    return await _with_retries(url, fetch)
+
+
+# Elements whose contents are not page text; BeautifulSoup's get_text skips
+# script/style, but lxml's itertext does not, so they are emptied first
+_NON_TEXT_TAGS = ("script", "style", "noscript", "iframe")
+
+
+def _clear_non_text(node) -> None:
+    # Empty rather than remove the elements: strip_elements would merge each
+    # tail into the preceding text and glue the words on either side together
+    for bad in list(node.iter(*_NON_TEXT_TAGS)):
+        bad.clear(keep_tail=True)
+
+
+def _node_text(node, separator: str = "") -> str:
+    """
+    lxml counterpart of BeautifulSoup's get_text(separator=..., strip=True).
+    Call _clear_non_text on `node` first to match it exactly.
+    """
+    return separator.join(s for s in (t.strip() for t in node.itertext()) if s)
+
+
+def _xpath_class(name: str) -> str:
+    """
+    XPath predicate matching elements that have `name` among their classes.
+    """
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Selectors are compiled once here rather than re-parsed for every page
+_LISTING_TITLE_SELECTOR = CSSSelector("h3.entry-title.td-module-title")
+_ANY_LINK_XPATH = etree.XPath("//a[@href]")
+_TITLE_SELECTORS = [
+    CSSSelector("h1"),
+    CSSSelector("h1.entry-title"),
+    CSSSelector("h1.td-page-title"),
+    CSSSelector("h1.post-title"),
+]
+# Content selectors in priority order; each returns only its first match
+_CONTENT_XPATHS = [
+    etree.XPath(f"(//div[{_xpath_class('tdb-block-inner')} and {_xpath_class('td-fix-index')}])[1]"),  # your original
+    etree.XPath(f"(//div[{_xpath_class('td-post-content')}])[1]"),  # common td theme
+    etree.XPath(f"(//div[{_xpath_class('entry-content')}])[1]"),
+    etree.XPath(f"(//div[{_xpath_class('post-content')}])[1]"),
+    etree.XPath("(//article)[1]"),
+]
+
+
 def extract_article_links(listing_html: str, base_url: str) -> List[str]:
     """
     Extract article links from the listing page.
     The selector is tuned to the structure you used earlier, but has fallbacks.
     """
-    soup = BeautifulSoup(listing_html, "lxml")
+    if not listing_html.strip():
+        return []
+    tree = lxml_html.fromstring(listing_html)
     links: List[str] = []
 
-    for h3 in soup.find_all("h3", class_="entry-title td-module-title"):
-        a = h3.find("a", href=True)
-        if a:
-            links.append(urljoin(base_url, a["href"]))
+    for h3 in _LISTING_TITLE_SELECTOR(tree):
+        a = h3.find(".//a[@href]")
+        if a is not None:
+            links.append(urljoin(base_url, a.get("href")))
 
     # Fallback #1: common article link pattern (article titles)
     if not links:
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
+        for a in _ANY_LINK_XPATH(tree):
+            href = a.get("href")
             # simple heuristic for article links: same domain + path length > 1 and includes year or words
             if href.startswith(base_url) or urljoin(base_url, href).startswith(base_url):
                 full = urljoin(base_url, href)
@@ -127,108 +315,178 @@ def extract_article_links(listing_html: str, base_url: str) -> List[str]:
                 links.append(full)
 
     # Deduplicate preserving order
-    seen = set()
-    uniq_links = []
-    for l in links:
-        if l not in seen:
-            seen.add(l)
-            uniq_links.append(l)
+    return list(dict.fromkeys(links))
+
+
+# HTML is parsed incrementally and reading stops as soon as the main post
+# content has been closed with usable text in it; anything after it
+# (comments, footer, related posts) is never downloaded or parsed.
 
-    return uniq_links
+_IS_POST_CONTENT = etree.XPath(f"self::div[{_xpath_class('td-post-content')}]")
 
 
-from typing import Tuple
+def _new_stream_parser(encoding: Optional[str] = None) -> etree.HTMLPullParser:
+    # `encoding` is the charset from the HTTP headers, if any; without it
+    # lxml falls back to <meta charset> or its own detection
+    return etree.HTMLPullParser(events=("end",), encoding=encoding)
 
-def extract_article_content(html: str) -> Tuple[str, str]:
+
+def _feed_stream_parser(parser: etree.HTMLPullParser, chunk: bytes) -> bool:
+    """
+    Feed one chunk; return True once a post content div has been closed
+    that holds enough text to be picked as the content.
+    """
+    parser.feed(chunk)
+    for _, elem in parser.read_events():
+        if _IS_POST_CONTENT(elem):
+            _clear_non_text(elem)
+            if len(_node_text(elem, separator="\n")) > MIN_CONTENT_LENGTH:
+                return True
+    return False
+
+
+def _close_stream_parser(parser: etree.HTMLPullParser):
+    try:
+        return parser.close()
+    except etree.XMLSyntaxError:
+        # Empty document
+        return None
+
+
+def extract_article_content(chunks: Iterable[bytes], encoding: Optional[str] = None) -> Tuple[str, str]:
     """
     Return (title, content_text). Use a few fallbacks for selectors.
     """
-    soup = BeautifulSoup(html, "lxml")
+    parser = _new_stream_parser(encoding)
+    for chunk in chunks:
+        if _feed_stream_parser(parser, chunk):
+            break
+    return _extract_from_tree(_close_stream_parser(parser))
+
+
+def _extract_from_tree(tree) -> Tuple[str, str]:
+    if tree is None:
+        return "untitled", ""
 
     
     title = ""
-    if soup.title and soup.title.string:
-        title = soup.title.string.strip()
+    title_tag = tree.find(".//title")
+    if title_tag is not None and title_tag.text:
+        title = title_tag.text.strip()
 
     # Look for common in-page title elements
-    for sel in [
-        ("h1", {}),
-        ("h1", {"class": "entry-title"}),
-        ("h1", {"class": "td-page-title"}),
-        ("h1", {"class": "post-title"}),
-    ]:
-        tag = soup.find(sel[0], sel[1])
-        if tag and tag.get_text(strip=True):
-            title = tag.get_text(strip=True)
+    for sel in _TITLE_SELECTORS:
+        tags = sel(tree)
+        if tags and _node_text(tags[0]):
+            title = _node_text(tags[0])
             break
-    content_selectors = [
-        ("div", {"class": "tdb-block-inner td-fix-index"}),  # your original
-        ("div", {"class": "td-post-content"}),               # common td theme
-        ("div", {"class": "entry-content"}),
-        ("div", {"class": "post-content"}),
-        ("article", {}),
-    ]
-
     content_text = ""
-    for name, attrs in content_selectors:
-        node = soup.find(name, attrs=attrs)
-        if node:
-            # remove script/style
-            for bad in node.find_all(["script", "style", "noscript", "iframe"]):
-                bad.decompose()
-            text = node.get_text(separator="\n", strip=True)
-            if text and len(text) > 50:
-                content_text = text
-                break
+    for xpath in _CONTENT_XPATHS:
+        nodes = xpath(tree)
+        if not nodes:
+            continue
+        node = nodes[0]
+        # remove script/style
+        _clear_non_text(node)
+        text = _node_text(node, separator="\n")
+        if text and len(text) > MIN_CONTENT_LENGTH:
+            content_text = text
+            break
 
     if not content_text:
-        body = soup.body
-        if body:
-            candidates = []
-            for div in body.find_all(["div", "section", "article"]):
-                txt = div.get_text(separator="\n", strip=True)
-                candidates.append((len(txt), txt))
-            if candidates:
-                candidates.sort(reverse=True)
-                largest = candidates[0][1]
-                if len(largest) > 100:
-                    content_text = largest
+        body = tree.find(".//body")
+        if body is not None:
+            _clear_non_text(body)
+            # Size every subtree bottom-up in a single walk, as the length
+            # _node_text(el, "\n") would return, and only extract the winner.
+            sizes = {}
+            largest, largest_size = None, 0
+            for _, el in etree.iterwalk(body, events=("end",)):
+                chars = pieces = 0
+                own = (el.text or "").strip()
+                if own:
+                    chars, pieces = len(own), 1
+                for child in el:
+                    child_chars, child_pieces = sizes.pop(child, (0, 0))
+                    tail = (child.tail or "").strip()
+                    if tail:
+                        child_chars, child_pieces = child_chars + len(tail), child_pieces + 1
+                    chars, pieces = chars + child_chars, pieces + child_pieces
+                sizes[el] = (chars, pieces)
+
+                size = chars + max(pieces - 1, 0)
+                if el.tag in ("div", "section", "article") and size > largest_size:
+                    largest, largest_size = el, size
+
+            if largest is not None and largest_size > 100:
+                content_text = _node_text(largest, separator="\n")
 
     return title or "untitled", content_text or ""
 
 
-def scrape_articles(base_url: str):
+async def scrape_articles(base_url: str):
     print(f"[START] Scraping listing: {base_url}")
-    listing_html = fetch_html(base_url)
-    if not listing_html:
-        print("[ERROR] Could not load the base listing page. Exiting.")
-        return
-
-    links = extract_article_links(listing_html, base_url)
-    if ARTICLE_LIMIT:
-        links = links[:ARTICLE_LIMIT]
-
-    print(f"[INFO] Found {len(links)} candidate links.")
-
-    for idx, link in enumerate(links, start=1):
-        print(f"\n[{idx}/{len(links)}] Processing: {link}")
-        # polite delay
-        time.sleep(DELAY_BETWEEN_REQUESTS)
-
-        article_html = fetch_html(link)
-        if not article_html:
-            print("[WARN] Skipping due to fetch failure.")
-            continue
-
-        title, content = extract_article_content(article_html)
-        if not content.strip():
-            print("[WARN] No content extracted for:", link)
-            continue
-
-        save_article_to_txt(title=title, url=link, content=content)
+    async with httpx.AsyncClient(
+        http2=True,
+        headers=CLIENT_HEADERS,
+        timeout=REQUEST_TIMEOUT,
+        follow_redirects=True,
+    ) as client:
+        # Serializes cloudscraper fallbacks; see fetch_article
+        fallback_lock = asyncio.Lock()
+        listing_html = await fetch_listing(client, base_url, fallback_lock)
+        if not listing_html:
+            print("[ERROR] Could not load the base listing page. Exiting.")
+            return
+
+        links = extract_article_links(listing_html, base_url)
+        if ARTICLE_LIMIT:
+            links = links[:ARTICLE_LIMIT]
+
+        print(f"[INFO] Found {len(links)} candidate links.")
+
+        with os.scandir(SAVE_DIR) as entries:
+            existing = {entry.name.casefold() for entry in entries}
+
+        # Up to MAX_CONCURRENT_REQUESTS articles in flight. Article fetches
+        # start at most once every DELAY_BETWEEN_REQUESTS / MAX_CONCURRENT_REQUESTS
+        # seconds across all slots, i.e. up to MAX_CONCURRENT_REQUESTS times
+        # the request rate of the sequential scraper.
+        sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        start_interval = DELAY_BETWEEN_REQUESTS / MAX_CONCURRENT_REQUESTS
+        start_lock = asyncio.Lock()
+        next_start = 0.0
+
+        async def wait_for_start() -> None:
+            nonlocal next_start
+            async with start_lock:
+                now = time.monotonic()
+                if next_start > now:
+                    await asyncio.sleep(next_start - now)
+                    now = next_start
+                next_start = now + start_interval
+
+        async def process(idx: int, link: str) -> None:
+            async with sem:
+                await wait_for_start()
+                print(f"\n[{idx}/{len(links)}] Processing: {link}")
+                result = await fetch_article(client, link, fallback_lock)
+
+            if not result:
+                print("[WARN] Skipping due to fetch failure.")
+                return
+
+            title, content = result
+            if not content.strip():
+                print("[WARN] No content extracted for:", link)
+                return
+
+            save_article_to_txt(title=title, url=link, content=content, existing=existing)
+
+        await asyncio.gather(*(process(idx, link) for idx, link in enumerate(links, start=1)))
 
     print("\n[DONE] Scraping finished.")
 
 
 if __name__ == "__main__":
-    scrape_articles(BASE_URL)
+    asyncio.run(scrape_articles(BASE_URL))